@@ -14,13 +14,22 @@ from wsgiref.simple_server import make_server, WSGIRequestHandler
 
 import bottle
 
+try:
+    import waitress
+except ImportError:
+    waitress = None
+
 log = logging.getLogger(__file__)
 app = bottle.Bottle()
 
+# constant response body, so it doesn't need to be serialized per request
+_HELLO = b'{"msg": "Hello world!"}'
+
 
 @app.get('/')
 def hello():
-    return {'msg': "Hello world!"}
+    bottle.response.content_type = 'application/json'
+    return _HELLO
 
 
 class QuietServer(bottle.WSGIRefServer):
@@ -49,13 +58,19 @@ def main(args=None):
     logging.basicConfig(format="%(name)s: %(levelname)s - %(message)s",
         level=logging.DEBUG if args.verbose else logging.INFO)
 
-    try:
+    if waitress:
+        server = bottle.WaitressServer(host='0.0.0.0', port=8080, threads=8)
+    else:
+        log.debug("waitress not installed, falling back to wsgiref server.")
         server = QuietServer(host='0.0.0.0', port=8080)
+
+    try:
         app.run(server=server, debug=True, quiet=True)
     except KeyboardInterrupt:
         pass
     finally:
-        server.srv.server_close()
+        if getattr(server, 'srv', None):
+            server.srv.server_close()
         print("Server shut down.")
 
 
@@ -20,11 +20,17 @@ and the example code at the end of the module for usage information.
 """
 
 
-__all__ = ('Jsonable', 'JsonifyDecoder', 'JsonifyEncoder', 'dumps', 'loads')
+__all__ = ('Jsonable', 'JsonifyDecoder', 'JsonifyEncoder', 'dumpb', 'dumps', 'loads')
 
 import datetime
-import inspect
+import enum
 import json
+import uuid
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 DATETIME_FMT = "%Y%m%dT%H:%M:%S.%f"
@@ -40,25 +46,56 @@ class Jsonable(object):
         Returns dict of attribute name/value pairs with the class name of the
         instance added under the key ``'__class__'``.
 
-        If the object has a ``__dir__`` method, it is expected to return an
-        iterable of the names of the attributes, which make up the returned
-        state dict. Otherwise the list of attributes is obtained by taking
-        the value of the ``__dict__`` attribute of the instance and filtering
-        out any attributes whose name starts with two underscores.
+        The attributes are taken from the ``__dict__`` attribute of the
+        instance, filtering out any attributes whose name starts with two
+        underscores and any callable values.
 
         """
-        attrlister = getattr(self, '__dir__', None)
-        if callable(attrlister):
-            attr = {a: getattr(self, a) for a in attrlister()
-                    if not a.startswith('__') and not inspect.ismethod(getattr(self, a))}
-        else:
-            attr = {a:v for a,v in self.__dict__.items()
-                    if not a.startswith('__')}
-
+        attr = {a: v for a, v in vars(self).items()
+                if not a.startswith('__') and not callable(v)}
         attr['__class__'] = self.__class__.__name__
         return attr
 
 
+def _default(obj):
+    """Return JSON-serializable representation of objects of additional types.
+
+    Used as the ``default`` callback by ``JsonifyEncoder`` and, if available,
+    by ``orjson``. Raises ``TypeError`` for unsupported objects.
+
+    """
+    # datetime/date are checked first, since on Python >= 3.11 all objects
+    # have a __getstate__ method. They are encoded as single-key dicts,
+    # which are cheap to create and to recognize when decoding.
+    if isinstance(obj, datetime.datetime):
+        return {'$dt': [obj.year, obj.month, obj.day, obj.hour, obj.minute, obj.second,
+                        obj.microsecond]}
+    elif isinstance(obj, datetime.date):
+        return {'$d': [obj.year, obj.month, obj.day]}
+    # encoded like orjson does natively, so the output doesn't depend on it
+    elif isinstance(obj, uuid.UUID):
+        return str(obj)
+    elif isinstance(obj, enum.Enum):
+        return obj.value
+
+    jsonify = getattr(obj, '__json__', None)
+    if callable(jsonify):
+        return jsonify()
+
+    # object.__getstate__ (Python >= 3.11) returns None for objects without
+    # instance state, e.g. Decimal or frozenset, which are thus unsupported.
+    # For orjson this also makes dumpb fall back to the stdlib encoder for
+    # types it handles natively, e.g. namedtuples.
+    getstate = getattr(obj, '__getstate__', None)
+    if callable(getstate):
+        state = getstate()
+        if state is not None:
+            return state
+
+    raise TypeError("Object of type %s is not JSON serializable" %
+                    obj.__class__.__name__)
+
+
 class JsonifyEncoder(json.JSONEncoder):
     """Subclass of json.JSONEncoder, which supports additional types.
 
@@ -68,35 +105,7 @@ class JsonifyEncoder(json.JSONEncoder):
     """
 
     def default(self, obj):
-        for method in ('__json__', '__getstate__'):
-            jsonify = getattr(obj, method, None)
-            if callable(jsonify):
-                return jsonify()
-
-        if isinstance(obj, datetime.datetime):
-            return {
-                '__class__': '_datetime',
-                '__newargs__': [
-                    obj.year,
-                    obj.month,
-                    obj.day,
-                    obj.hour,
-                    obj.minute,
-                    obj.second,
-                    obj.microsecond
-                ]
-            }
-        elif isinstance(obj, datetime.date):
-            return {
-                '__class__': '_date',
-                '__newargs__': [
-                    obj.year,
-                    obj.month,
-                    obj.day
-                ]
-            }
-        else:
-            return super(JsonifyEncoder, self).default(obj)
+        return _default(obj)
 
 
 class JsonifyDecoder(json.JSONDecoder):
@@ -104,51 +113,123 @@ class JsonifyDecoder(json.JSONDecoder):
         kw.setdefault('object_hook', self.decode_object)
         super(JsonifyDecoder, self).__init__(**kw)
         self._namespace = namespace or {}
+        # for decoding the previous datetime/date encoding
         self._namespace.setdefault('_date', datetime.date)
         self._namespace.setdefault('_datetime', datetime.datetime)
 
-    def decode_object(self, obj, namespace=None):
-        """Decode dict or list resulting from decoded JSON object notation."""
-        if isinstance(obj, list):
-            pairs = enumerate(obj)
-        elif isinstance(obj, dict):
-            pairs = obj.items()
+    def decode_object(self, obj):
+        """Decode dict resulting from decoded JSON object notation.
 
-        result = []
-        for key, val in pairs:
-            if isinstance(val, (dict, list)):
-                val = self.decode_object(val, namespace)
+        Used as the ``object_hook``, which the JSON decoder calls for each
+        decoded object bottom-up, so nested objects are already decoded.
 
-            result.append((key, val))
+        Single-key dicts with the key ``'$dt'`` or ``'$d'`` and a list of
+        datetime resp. date fields as value are decoded as datetime resp. date
+        instances. Note that this means that documents containing such dicts
+        can not be round-tripped unchanged. Dicts with one of these keys but a
+        value, which is not a valid list of fields, are returned as is.
 
-        if isinstance(obj, list):
-            return [x[1] for x in result]
-        elif isinstance(obj, dict):
-            result = dict(result)
-            clsname = result.pop('__class__', None)
+        """
+        if len(obj) == 1 and ('$dt' in obj or '$d' in obj):
+            if '$dt' in obj:
+                cls, args, minargs, maxargs = datetime.datetime, obj['$dt'], 3, 7
+            else:
+                cls, args, minargs, maxargs = datetime.date, obj['$d'], 3, 3
 
-            if clsname:
+            if isinstance(args, list) and minargs <= len(args) <= maxargs:
                 try:
-                    cls = getattr(self._namespace, clsname)
-                except AttributeError:
-                    cls = self._namespace.get(clsname)
+                    return cls(*args)
+                except (TypeError, ValueError):
+                    pass
 
-                if cls is None:
-                    raise NameError("name '%s' not found in given namespace." %
-                                    clsname)
+            return obj
 
-                inst = cls.__new__(cls, *result.pop('__newargs__', ()))
+        clsname = obj.pop('__class__', None)
 
-                try:
-                    getattr(inst, '__setstate__')(result)
-                except AttributeError:
-                    for k in result:
-                        if not k.startswith('__'):
-                            setattr(inst, k, result[k])
+        if not clsname:
+            return obj
 
-                return inst
-            else:
-                return result
+        try:
+            cls = getattr(self._namespace, clsname)
+        except AttributeError:
+            cls = self._namespace.get(clsname)
+
+        if cls is None:
+            raise NameError("name '%s' not found in given namespace." % clsname)
+
+        inst = cls.__new__(cls, *obj.pop('__newargs__', ()))
+
+        try:
+            getattr(inst, '__setstate__')(obj)
+        except AttributeError:
+            for k in obj:
+                if not k.startswith('__'):
+                    setattr(inst, k, obj[k])
+
+        return inst
+
+    def _walk(self, obj):
+        """Decode all objects in a tree of already parsed dicts and lists.
+
+        The tree is traversed iteratively and modified in place, so that the
+        nesting depth is not limited by the Python recursion limit.
+
+        """
+        root = [obj]
+        stack = [(root, 0)]
+        nodes = []
+
+        # collect (parent, key) of all containers, parents before children
+        while stack:
+            parent, key = stack.pop()
+            node = parent[key]
+            nodes.append((parent, key, node))
+
+            for k, v in (enumerate(node) if isinstance(node, list) else node.items()):
+                if isinstance(v, (dict, list)):
+                    stack.append((node, k))
+
+        # decode objects bottom-up, like the object_hook of the JSON decoder
+        for parent, key, node in reversed(nodes):
+            if isinstance(node, dict):
+                parent[key] = self.decode_object(node)
+
+        return root[0]
+
+
+# Instances used by dumps/loads when called without extra keyword arguments
+_ENCODER = JsonifyEncoder()
+_DECODER = JsonifyDecoder(namespace=globals())
+
+
+def dumpb(obj, **kw):
+    """Serialize obj to JSON formatted UTF-8 bytes with support for class instances.
+
+    If the ``orjson`` package is installed and no keyword arguments are given,
+    it is used for serialization. Otherwise this falls back to ``dumps``, to
+    which all keyword arguments are passed, and encodes its result.
+
+    The output of both paths decodes to the same objects, with one exception:
+    orjson encodes non-finite floats (``nan``, ``inf``, ``-inf``) as ``null``,
+    whereas ``dumps`` writes them as ``NaN``/``Infinity``, which is not valid
+    JSON. Use ``dumps`` if these values need to be preserved.
+
+    """
+    if orjson and not kw:
+        try:
+            # datetime/date instances and dataclasses are passed to _default,
+            # so they are encoded the same way as by JsonifyEncoder.
+            data = orjson.dumps(obj, default=_default,
+                                option=orjson.OPT_PASSTHROUGH_DATETIME |
+                                orjson.OPT_PASSTHROUGH_DATACLASS)
+        except orjson.JSONEncodeError:
+            # e.g. non-str dict keys or integers exceeding 64 bits, which the
+            # standard library encoder handles (or reports an error for)
+            pass
+        else:
+            return data
+
+    return dumps(obj, **kw).encode('utf-8')
 
 
 def dumps(obj, **kw):
@@ -159,6 +240,9 @@ def dumps(obj, **kw):
     encoder class, which is set to ``JsonifyEncoder`` by default.
 
     """
+    if not kw:
+        return _ENCODER.encode(obj)
+
     kw.setdefault('cls', JsonifyEncoder)
     return json.dumps(obj, **kw)
 
@@ -166,22 +250,42 @@ def dumps(obj, **kw):
 def loads(s, namespace=None, **kw):
     """Deserialize string to a Python object with support for class instances.
 
+    *s* may be a str or UTF-8 encoded bytes.
+
     *namespace* is a dict-like or module object, which is used to resolve class
     names of JSON-ified class instances. By default the global *module*
     namespace is used, which probably isn't what you want. Normally you would
     pass something like the return value of ``globals()`` or ``locals()``.
 
-    The remaining keyword arguments are passed to ``json.loads``, which in turn
+    If the ``orjson`` package is installed and no further keyword arguments
+    are given, it is used for parsing, falling back to ``JsonifyDecoder`` if
+    orjson rejects the input (e.g. ``NaN`` or lone surrogates). Otherwise the
+    remaining keyword arguments are passed to ``json.loads``, which in turn
     passes any keyword arguments it doesn't recognize to the init method of
     the JSON decoder class, which is set to ``JsonifyDecoder`` by default.
 
     """
-    if namespace is None:
-        namespace = globals()
+    if kw:
+        kw.setdefault('cls', JsonifyDecoder)
+        kw['namespace'] = globals() if namespace is None else namespace
+        return json.loads(s, **kw)
+
+    decoder = _DECODER if namespace is None else JsonifyDecoder(namespace=namespace)
+
+    if orjson:
+        try:
+            obj = orjson.loads(s)
+        except orjson.JSONDecodeError:
+            # e.g. NaN/Infinity or lone surrogates, which the standard library
+            # encoder may emit and decoder accepts
+            pass
+        else:
+            return decoder._walk(obj) if isinstance(obj, (dict, list)) else obj
+
+    if isinstance(s, bytes):
+        s = s.decode('utf-8')
 
-    kw.setdefault('cls', JsonifyDecoder)
-    kw['namespace'] = namespace
-    return json.loads(s, **kw)
+    return decoder.decode(s)
 
 
 if __name__ == '__main__':
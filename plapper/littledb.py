@@ -9,15 +9,17 @@ serializable via Pickle, JSON or msgpack.
 
 from __future__ import absolute_import, print_function
 
-import collections
 import datetime
+import itertools
+import operator
+import pickle
 import sqlite3
 import threading
 
 try:
-    import cPickle as pickle
+    import msgpack
 except ImportError:
-    import pickle
+    msgpack = None
 
 try:
     import umsgpack
@@ -37,83 +39,129 @@ SQL_INSERT_DOCUMENT = 'INSERT OR REPLACE INTO "{}" VALUES (?, ?)'
 SQL_SELECT_DOCUMENT = 'SELECT content FROM "{}" WHERE key = ?'
 SQL_SELECT_DOCUMENTS = 'SELECT content FROM "{}" WHERE key {} ?'
 SQL_SELECT_KEYS = 'SELECT key FROM "{}"'
+SQL_SELECT_KEYS_DOCUMENTS = 'SELECT key, content FROM "{}" WHERE key IN ({})'
+# default value of SQLITE_MAX_VARIABLE_NUMBER for sqlite < 3.32.0
+SQL_MAX_VARIABLES = 999
 
+_itemgetter0 = operator.itemgetter(0)
 
-class RegistrableMeta(type):
-    """Meta-class for Adapter class and sub-classes.
 
-    Holds a registry of all sub-classes.
-    """
-    registry = collections.OrderedDict()
-
-    def __init__(cls, clsname, bases, classdict):
-        cls.registry[cls.format] = cls
+_ADAPTERS = {}
 
-    def from_format(cls, format):
-        return cls.registry.get(format)
 
+def register(format):
+    """Return class decorator registering an adapter class for *format*."""
+    def decorator(cls):
+        cls.format = format
+        _ADAPTERS[format] = cls
+        return cls
 
-Adapter = RegistrableMeta('Adapter', (object,), {'format': None})
+    return decorator
 
 
-class PickleAdapter(Adapter):
-    format = 'pickle'
-
+@register('pickle')
+class PickleAdapter(object):
     @staticmethod
     def from_dict(data):
-        return pickle.dumps(data)
+        return pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
 
     @staticmethod
     def to_dict(s):
         return pickle.loads(s)
 
 
-class JsonAdapter(Adapter):
-    format = 'json'
-
+@register('json')
+class JsonAdapter(object):
     @staticmethod
     def from_dict(obj):
-        return jsonify.dumps(obj).encode('utf-8')
+        return jsonify.dumpb(obj)
 
     @staticmethod
     def to_dict(data):
-        return jsonify.loads(data.decode('utf-8'))
-
-
-if umsgpack:
-    class MsgPackAdapter(Adapter):
-        date_fmt = "%Y%m%d"
-        datetime_fmt = "%Y%m%dT%H:%M:%S.%f"
-        format = 'msgpack'
+        return jsonify.loads(data)
+
+
+if msgpack or umsgpack:
+    @register('msgpack')
+    class MsgPackAdapter(object):
+        """Adapter using the msgpack C extension or, if not installed, umsgpack.
+
+        Dates are stored as ext type 0x10 with an ISO 8601 date string
+        (``YYYY-MM-DD``), datetimes as ext type 0x20 with a fixed-width string
+        in the layout ``YYYYMMDDTHH:MM:SS.ffffff`` (``strftime`` format
+        ``"%Y%m%dT%H:%M:%S.%f"``), which ``from_datetime`` and ``to_datetime``
+        produce and parse.
+
+        """
+
+        def __init__(self):
+            # Build the keyword arguments for pack/unpack once instead of per call
+            if msgpack:
+                self._ext_type = msgpack.ExtType
+                self._packb = msgpack.packb
+                self._unpackb = msgpack.unpackb
+                self._pack_kw = dict(default=self._default, use_bin_type=True)
+                self._unpack_kw = dict(ext_hook=self._ext_hook, raw=False, strict_map_key=False)
+            else:
+                self._ext_type = umsgpack.Ext
+                self._packb = umsgpack.packb
+                self._unpackb = umsgpack.unpackb
+                self._pack_kw = dict(ext_handlers={
+                    datetime.date: self.from_date,
+                    datetime.datetime: self.from_datetime
+                })
+                self._unpack_kw = dict(ext_handlers={
+                    0x10: lambda ext: self.to_date(ext.data),
+                    0x20: lambda ext: self.to_datetime(ext.data)
+                })
 
         def from_date(self, date):
-            return umsgpack.Ext(0x10, date.isoformat().encode())
+            return self._ext_type(0x10, date.isoformat().encode())
 
-        def to_date(self, ext):
-            return datetime.date(*(int(v) for v in ext.data.split(b'-')))
+        def to_date(self, data):
+            return datetime.date(*(int(v) for v in data.split(b'-')))
 
         def from_datetime(self, dt):
-            return umsgpack.Ext(0x20, dt.strftime(self.datetime_fmt).encode())
-
-        def to_datetime(self, ext):
-            return datetime.datetime.strptime(ext.data.decode('ascii'), self.datetime_fmt)
+            # Equivalent to dt.strftime("%Y%m%dT%H:%M:%S.%f"), but without
+            # parsing the format string on each call.
+            return self._ext_type(0x20, b"%04d%02d%02dT%02d:%02d:%02d.%06d" % (
+                dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second, dt.microsecond))
+
+        def to_datetime(self, data):
+            # Parses the fixed-width output of from_datetime by slicing,
+            # which is much cheaper than datetime.strptime.
+            return datetime.datetime(int(data[0:4]), int(data[4:6]), int(data[6:8]),
+                                     int(data[9:11]), int(data[12:14]), int(data[15:17]),
+                                     int(data[18:24]))
+
+        def _default(self, obj):
+            if isinstance(obj, datetime.datetime):
+                return self.from_datetime(obj)
+            elif isinstance(obj, datetime.date):
+                return self.from_date(obj)
+            else:
+                raise TypeError("can not serialize %r object" % obj.__class__.__name__)
+
+        def _ext_hook(self, code, data):
+            if code == 0x20:
+                return self.to_datetime(data)
+            elif code == 0x10:
+                return self.to_date(data)
+            else:
+                return msgpack.ExtType(code, data)
 
         def from_dict(self, obj):
-            return umsgpack.packb(obj, ext_handlers={
-                datetime.date: self.from_date,
-                datetime.datetime: self.from_datetime
-            })
+            return self._packb(obj, **self._pack_kw)
 
         def to_dict(self, data):
-            return umsgpack.unpackb(data, ext_handlers={
-                0x10: self.to_date,
-                0x20: self.to_datetime
-            })
+            return self._unpackb(data, **self._unpack_kw)
 
 
 class Collection(object):
     def __init__(self, db, name, format, adapter):
         self.db = db
+        # bound method of db, saves an attribute lookup per call
+        self._connection = db.connection
         self.name = name
         self.format = format
         self._from_dict = adapter.from_dict
@@ -123,15 +171,12 @@ class Collection(object):
         self.SQL_SELECT_KEYS = SQL_SELECT_KEYS.format(name)
 
     def get(self, key):
-        con = self.db.connection()
-        cur = con.execute(self.SQL_SELECT_DOCUMENT, (key,))
-        try:
-            val = cur.fetchone()[0]
-        except (IndexError, TypeError):
+        row = self._connection().execute(self.SQL_SELECT_DOCUMENT, (key,)).fetchone()
+
+        if row is None:
             raise KeyError(key)
-        finally:
-            cur.close()
 
+        val = row[0]
         if isinstance(val, bytes):
             return self._to_dict(val)
         else:
@@ -139,12 +184,34 @@ class Collection(object):
 
     __getitem__ = get
 
+    def get_many(self, keys):
+        """Return iterator of (key, document) pairs for all given keys.
+
+        Documents are fetched with one query per ``SQL_MAX_VARIABLES`` keys.
+        Keys not found in the collection are skipped and the pairs are not
+        necessarily returned in the order of the given keys.
+
+        """
+        con = self._connection()
+        to_dict = self._to_dict
+        keys = iter(keys)
+
+        while True:
+            chunk = tuple(itertools.islice(keys, SQL_MAX_VARIABLES))
+
+            if not chunk:
+                break
+
+            sql = SQL_SELECT_KEYS_DOCUMENTS.format(self.name, ','.join('?' * len(chunk)))
+            for key, val in con.execute(sql, chunk):
+                yield key, to_dict(val) if isinstance(val, bytes) else val
+
     def set(self, key, data):
-        con = self.db.connection()
+        con = self._connection()
         if isinstance(data, dict):
             data = self._from_dict(data)
 
-        if getattr(con, 'in_transaction', True):
+        if con.in_transaction:
             con.execute(self.SQL_INSERT_DOCUMENT, (key, data))
         else:
             with con:
@@ -152,14 +219,27 @@ class Collection(object):
 
     __setitem__ = set
 
+    def set_many(self, items):
+        """Store all documents from an iterable of (key, data) pairs."""
+        con = self._connection()
+        from_dict = self._from_dict
+        params = ((key, from_dict(data) if isinstance(data, dict) else data)
+                  for key, data in items)
+
+        if con.in_transaction:
+            con.executemany(self.SQL_INSERT_DOCUMENT, params)
+        else:
+            with con:
+                con.executemany(self.SQL_INSERT_DOCUMENT, params)
+
     def select(self, value, op='LIKE'):
-        con = self.db.connection()
+        con = self._connection()
         cur = con.execute(SQL_SELECT_DOCUMENTS.format(self.name, op), (value,))
         return (self._to_dict(row[0]) if isinstance(row[0], bytes) else row[0]
                 for row in cur.fetchall())
 
     def keys(self):
-        return (r[0] for r in self.db.connection().execute(self.SQL_SELECT_KEYS))
+        return map(_itemgetter0, self._connection().execute(self.SQL_SELECT_KEYS))
 
     def begin(self):
         self.db.begin()
@@ -169,18 +249,55 @@ class Collection(object):
 
 
 class LittleDB(object):
-    def __init__(self, filename):
+    """Key-value store of document collections in an sqlite3 database file.
+
+    The keyword arguments set the sqlite PRAGMAs of the same name on each new
+    connection. The defaults favour write throughput: 8 KiB pages, a
+    write-ahead log, which is only synced to disk at checkpoints, a 64 MiB
+    page cache and memory-mapped reads of up to 256 MiB. Pass
+    ``synchronous='OFF'`` if durability doesn't matter, or ``None`` to leave
+    a setting at sqlite's default.
+
+    The page size only takes effect when the database file is created, i.e.
+    it does not change the page size of existing databases.
+
+    """
+
+    def __init__(self, filename, page_size=8192, journal_mode='WAL', synchronous='NORMAL',
+                 temp_store='MEMORY', cache_size=-65536, mmap_size=268435456):
         self.filename = filename
+        # page_size must be set before switching to WAL mode
+        self.pragmas = [
+            ('page_size', page_size),
+            ('journal_mode', journal_mode),
+            ('synchronous', synchronous),
+            ('temp_store', temp_store),
+            ('cache_size', cache_size),
+            ('mmap_size', mmap_size),
+        ]
         self._local = threading.local()
         self._adapters = {}
 
     def connection(self):
+        """Return the database connection for the current thread.
+
+        The connection is opened on first use in each thread and cached until
+        it is closed via ``close``. Do not close the returned connection
+        directly: the cached connection is not checked for validity, so all
+        further use of this instance in the same thread would raise
+        ``sqlite3.ProgrammingError``.
+
+        """
         try:
-            con = getattr(self._local, 'connection')
-            con.total_changes  # test if connection is still valid (open)
-        except (AttributeError, sqlite3.ProgrammingError):
+            return self._local.connection
+        except AttributeError:
             con = self._local.connection = sqlite3.connect(self.filename)
-        return con
+
+            for name, value in self.pragmas:
+                if value is not None:
+                    con.execute('PRAGMA {} = {}'.format(name, value))
+
+            return con
 
     def begin(self):
         self.connection().execute('BEGIN TRANSACTION')
@@ -189,22 +306,27 @@ class LittleDB(object):
         self.connection().commit()
 
     def close(self):
-        con = getattr(self._local, 'connection', None)
+        """Close the database connection of the current thread.
+
+        The next call to ``connection`` in this thread opens a new one.
+
+        """
+        con = self._local.__dict__.pop('connection', None)
         if con:
             con.close()
 
     def get_collection(self, name, format='json'):
         if format not in self._adapters:
-            cls = Adapter.from_format(format)
+            cls = _ADAPTERS.get(format)
             if not cls:
                 raise NotImplementedError("No adapter found for format '{}'.".format(format))
 
-            self._adapters[format] = adapter = cls()
+            self._adapters[format] = cls()
 
         with self.connection() as con:
             con.execute(SQL_CREATE_TABLE.format(name))
 
-        return Collection(self, name, format, adapter)
+        return Collection(self, name, format, self._adapters[format])
 
 
 if __name__ == '__main__':
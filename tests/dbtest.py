@@ -60,24 +60,33 @@ class DBTest(object):
             pass
 
     @timed
-    def test_writes(self, iter):
+    def test_writes(self, keys, iter):
         self.begin()
-        for i, v in enumerate(iter):
-            self.write(str(i), v)
+        self.write_many(zip(keys, iter))
         self.commit()
 
     @timed
-    def test_reads(self, iter, valtype=int):
-        for i in iter:
-            v = self.read(str(i))
+    def test_reads(self, keys, valtype=int):
+        count = 0
+        for v in self.read_many(keys):
+            count += 1
+        assert count == len(keys)
         assert isinstance(v, valtype)
 
     def write(self, k, v):
         self._db[k] = v
 
+    def write_many(self, items):
+        for k, v in items:
+            self.write(k, v)
+
     def read(self, k):
         return self._db[k]
 
+    def read_many(self, keys):
+        for k in keys:
+            yield self.read(k)
+
     def begin(self):
         pass
 
@@ -113,6 +122,13 @@ class LittleDBTest(DBTest):
     def close(self):
         self._conn.close()
 
+    def write_many(self, items):
+        self._db.set_many(items)
+
+    def read_many(self, keys):
+        for k, v in self._db.get_many(keys):
+            yield v
+
     def begin(self):
         self._conn.begin()
 
@@ -161,6 +177,9 @@ class SqliteTest(DBTest):
     def write(self, k, v):
         self._db.execute("INSERT INTO data (key, value) VALUES (?, ?)", (k, v))
 
+    def write_many(self, items):
+        self._db.executemany("INSERT INTO data (key, value) VALUES (?, ?)", items)
+
     def read(self, k):
         cur = self._db.execute("SELECT value FROM data WHERE key=?", (k,))
         val = cur.fetchone()[0]
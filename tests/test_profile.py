@@ -34,6 +34,7 @@ print()
 print("Generating %i test documents..." % N)
 documents = [dict(id=i, value=random.random(), content=uuid.uuid4().hex)
              for i in range(N)]
+keys = [str(i) for i in range(N)]
 print()
 
 for clsname in ('LittleDBPickleTest', 'LittleDBJsonTest', 'LittleDBMsgpackTest'):
@@ -42,13 +43,13 @@ for clsname in ('LittleDBPickleTest', 'LittleDBJsonTest', 'LittleDBMsgpackTest')
     test = getattr(dbtest, clsname)(testdir)
 
     print("Profiling WRITING dictionaries with simple types...\n")
-    profile.run('test.test_writes(documents)', 'writestats')
+    profile.run('test.test_writes(keys, documents)', 'writestats')
     stats = pstats.Stats('writestats')
     stats.sort_stats('tottime')
     stats.print_stats()
 
     print("Profiling READING dictionaries with simple types...\n")
-    profile.run('test.test_reads(range(N), valtype=dict)', 'readstats')
+    profile.run('test.test_reads(keys, valtype=dict)', 'readstats')
     stats = pstats.Stats('readstats')
     stats.sort_stats('tottime')
     stats.print_stats()